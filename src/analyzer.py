@@ -3,15 +3,209 @@
 """
 import pandas as pd
 import numpy as np
-import pandas_ta as ta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Union, Tuple, Any
-import json
 
 from .utils.logger import setup_logger
+from .utils._njit import njit, NUMBA_AVAILABLE
 from .config import TECHNICAL_INDICATORS
 
 logger = setup_logger("analyzer")
 
+# TA-Libモジュール（初回使用時に読み込む。未インストールの場合は False）
+_talib = None
+
+
+def _get_talib() -> Any:
+    """
+    TA-Libを遅延読み込みして返す
+    
+    Returns:
+        Any: talibモジュール（未インストールの場合はNone）
+    """
+    global _talib
+    if _talib is None:
+        try:
+            import talib
+            _talib = talib
+        except ImportError:  # TA-Lib はCライブラリのインストールが必要なため任意依存とする
+            _talib = False
+    return _talib or None
+
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    累積和による単純移動平均（pandasの rolling(window=period).mean() 相当）
+    
+    Args:
+        values: 入力配列
+        period: 期間
+        
+    Returns:
+        np.ndarray: 移動平均（最初の period - 1 本はNaN）
+    """
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] < period:
+        return out
+        
+    cumsum = np.cumsum(values)
+    out[period - 1:] = cumsum[period - 1:]
+    out[period:] -= cumsum[:-period]
+    out[period - 1:] /= period
+    return out
+
+
+def _wilder_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilderの平滑化による平均（一括計算カーネル・TA-LibのRSIと同じ定義）
+    
+    Args:
+        values: 入力配列（先頭要素は使用しない）
+        period: 期間
+        
+    Returns:
+        np.ndarray: 平滑化した値（最初の period 本はNaN）
+    """
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] <= period:
+        return out
+        
+    # 最初の period 本の単純平均を初期値とし、以降は avg = (avg * (period - 1) + new) / period
+    seeded = values[period:].copy()
+    seeded[0] = values[1:period + 1].mean()
+    out[period:] = pd.Series(seeded).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+    return out
+
+
+@njit(
+    "void(float64[::1], int64[::1], int64[::1], int64, int64, int64, int64, int64, float64, "
+    "float64[:, ::1], float64[:, ::1], float64[::1], float64[::1], float64[::1], float64[::1], "
+    "float64[::1], float64[::1], float64[::1])",
+    cache=True,
+    nogil=True
+)
+def _compute_all(close, sma_periods, ema_periods, rsi_period, macd_fast, macd_slow, macd_signal,
+                 bb_period, bb_std, sma_out, ema_out, rsi_out, macd_out, signal_out, hist_out,
+                 bb_upper, bb_middle, bb_lower):
+    """
+    すべての指標を終値配列の1回の走査で計算し、事前確保した出力配列に書き込む
+    
+    EMAは pandas の ewm(adjust=False)、RSIはWilderの平滑化、ボリンジャーバンドは rolling().std()（ddof=1）と同じ定義。
+    
+    Args:
+        close: 終値配列
+        sma_periods: SMA期間の配列（sma_out の行に対応）
+        ema_periods: EMA期間の配列（ema_out の行に対応）
+        rsi_period: RSI期間
+        macd_fast, macd_slow, macd_signal: MACDの各期間
+        bb_period: ボリンジャーバンド期間
+        bb_std: ボリンジャーバンドの標準偏差倍率
+        sma_out, ema_out, rsi_out, macd_out, signal_out, hist_out,
+        bb_upper, bb_middle, bb_lower: 出力配列
+    """
+    n = close.shape[0]
+    n_sma = sma_periods.shape[0]
+    n_ema = ema_periods.shape[0]
+    
+    # SMA: 期間ごとの移動合計
+    sma_sums = np.zeros(n_sma)
+    
+    # EMA: 期間ごとの状態と平滑化係数
+    ema_values = np.zeros(n_ema)
+    ema_alphas = np.empty(n_ema)
+    for j in range(n_ema):
+        ema_alphas[j] = 2.0 / (ema_periods[j] + 1.0)
+    alpha_fast = 2.0 / (macd_fast + 1.0)
+    alpha_slow = 2.0 / (macd_slow + 1.0)
+    alpha_signal = 2.0 / (macd_signal + 1.0)
+    ema_fast = 0.0
+    ema_slow = 0.0
+    ema_signal = 0.0
+    
+    # RSI: Wilderの平均上昇幅・下落幅
+    avg_gain = 0.0
+    avg_loss = 0.0
+    
+    # ボリンジャーバンド: 窓付きWelfordの平均と偏差平方和
+    bb_mean = 0.0
+    bb_m2 = 0.0
+    
+    for i in range(n):
+        price = close[i]
+        
+        # SMA
+        for j in range(n_sma):
+            period = sma_periods[j]
+            sma_sums[j] += price
+            if i >= period:
+                sma_sums[j] -= close[i - period]
+            sma_out[j, i] = sma_sums[j] / period if i >= period - 1 else np.nan
+            
+        # EMA / MACD
+        if i == 0:
+            for j in range(n_ema):
+                ema_values[j] = price
+            ema_fast = price
+            ema_slow = price
+        else:
+            for j in range(n_ema):
+                ema_values[j] = ema_alphas[j] * price + (1.0 - ema_alphas[j]) * ema_values[j]
+            ema_fast = alpha_fast * price + (1.0 - alpha_fast) * ema_fast
+            ema_slow = alpha_slow * price + (1.0 - alpha_slow) * ema_slow
+        for j in range(n_ema):
+            ema_out[j, i] = ema_values[j]
+            
+        macd = ema_fast - ema_slow
+        if i == 0:
+            ema_signal = macd
+        else:
+            ema_signal = alpha_signal * macd + (1.0 - alpha_signal) * ema_signal
+        macd_out[i] = macd
+        signal_out[i] = ema_signal
+        hist_out[i] = macd - ema_signal
+        
+        # RSI
+        if i > 0:
+            change = price - close[i - 1]
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            if i <= rsi_period:
+                avg_gain += gain
+                avg_loss += loss
+                if i == rsi_period:
+                    avg_gain /= rsi_period
+                    avg_loss /= rsi_period
+            else:
+                avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+        if i < rsi_period:
+            rsi_out[i] = np.nan
+        elif avg_loss == 0.0:
+            rsi_out[i] = 100.0
+        else:
+            rsi_out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            
+        # ボリンジャーバンド
+        if i < bb_period:
+            delta = price - bb_mean
+            bb_mean += delta / (i + 1)
+            bb_m2 += delta * (price - bb_mean)
+        else:
+            old = close[i - bb_period]
+            old_mean = bb_mean
+            bb_mean += (price - old) / bb_period
+            bb_m2 += (price - old) * (price - bb_mean + old - old_mean)
+        if i >= bb_period - 1:
+            std_dev = np.sqrt(max(bb_m2 / (bb_period - 1), 0.0))
+            bb_middle[i] = bb_mean
+            bb_upper[i] = bb_mean + bb_std * std_dev
+            bb_lower[i] = bb_mean - bb_std * std_dev
+        else:
+            bb_middle[i] = np.nan
+            bb_upper[i] = np.nan
+            bb_lower[i] = np.nan
+
+
 class TechnicalAnalyzer:
     """テクニカル分析を行うクラス"""
     
@@ -22,13 +216,12 @@ class TechnicalAnalyzer:
         Args:
             ohlcv_data: OHLCV データフレーム
         """
-        self.data = ohlcv_data
-        self.indicators = {}
-        self.signals = {}
+        self.set_data(ohlcv_data)
         
     def set_data(self, ohlcv_data: pd.DataFrame) -> None:
         """
         分析対象のデータを設定
+        データフレームはコピーせず参照として保持する
         
         Args:
             ohlcv_data: OHLCV データフレーム
@@ -37,6 +230,36 @@ class TechnicalAnalyzer:
         # データ設定時にシグナルとインジケーターをリセット
         self.indicators = {}
         self.signals = {}
+        # 指標ごとの計算結果（ndarray）。シグナル判定で直接参照する
+        self._arr = {}
+        # 同一データに対する再計算を避けるためのキャッシュキー
+        self._cache_key = None
+        self._signals_key = None
+        
+        # 各列のndarrayを一度だけ取り出して保持する
+        if ohlcv_data is None or ohlcv_data.empty:
+            self._close_np = self._high_np = self._low_np = self._vol_np = None
+        else:
+            close_np = np.ascontiguousarray(ohlcv_data['close'].to_numpy(), dtype=np.float64)
+            finite = np.isfinite(close_np)
+            if not finite.all():
+                # 欠損した終値（ccxtのNone）が一括計算カーネルの移動合計・平滑化の状態を
+                # 以降すべてNaNにしないよう、直前の値（先頭の欠損は直後の値）で補完する
+                logger.warning("Forward-filling %d non-finite close prices", int((~finite).sum()))
+                close_np = pd.Series(np.where(finite, close_np, np.nan)).ffill().bfill().to_numpy()
+            self._close_np = close_np
+            self._high_np = ohlcv_data['high'].to_numpy(dtype=np.float64)
+            self._low_np = ohlcv_data['low'].to_numpy(dtype=np.float64)
+            self._vol_np = ohlcv_data['volume'].to_numpy(dtype=np.float64)
+        
+    def _make_cache_key(self) -> Tuple[int, Any, float]:
+        """
+        現在のデータを識別するキャッシュキーを作成
+        
+        Returns:
+            Tuple[int, Any, float]: (データ数, 最終インデックス, 最終終値)
+        """
+        return (len(self.data), self.data.index[-1], float(self.data['close'].iat[-1]))
         
     def calculate_all_indicators(self) -> Dict[str, Any]:
         """
@@ -49,61 +272,198 @@ class TechnicalAnalyzer:
             logger.error("No data available for indicator calculation")
             return {}
             
+        # 同じデータで計算済みであれば結果をそのまま返す
+        cache_key = self._make_cache_key()
+        if cache_key == self._cache_key and self.indicators:
+            return self.indicators
+            
         try:
-            # SMA（単純移動平均）
-            for period in TECHNICAL_INDICATORS["sma"]:
-                self.indicators[f"sma_{period}"] = self.data['close'].rolling(window=period).mean()
-                
-            # EMA（指数移動平均）
-            for period in TECHNICAL_INDICATORS["ema"]:
-                self.indicators[f"ema_{period}"] = self.data['close'].ewm(span=period, adjust=False).mean()
+            # set_data で変換済みの終値をすべての指標計算で再利用する
+            close_np = self._close_np
+            idx = self.data.index
+            
+            # データ数によって指標の定義が変わらないよう、Numbaが使える場合は常に一括計算カーネルを使う
+            if NUMBA_AVAILABLE:
+                values = self._calculate_fused(close_np)
+            elif _get_talib() is not None:
+                values = self._calculate_with_talib(close_np, idx)
+            else:
+                values = self._calculate_with_pandas(close_np, idx)
                 
-            # RSI（相対力指数）
-            period = TECHNICAL_INDICATORS["rsi"]
-            delta = self.data['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.rolling(window=period).mean()
-            avg_loss = loss.rolling(window=period).mean()
-            
-            rs = avg_gain / avg_loss
-            self.indicators["rsi"] = 100 - (100 / (1 + rs))
-            
-            # MACD（移動平均収束拡散法）
-            macd_config = TECHNICAL_INDICATORS["macd"]
-            exp1 = self.data['close'].ewm(span=macd_config["fast"], adjust=False).mean()
-            exp2 = self.data['close'].ewm(span=macd_config["slow"], adjust=False).mean()
-            macd = exp1 - exp2
-            signal = macd.ewm(span=macd_config["signal"], adjust=False).mean()
-            histogram = macd - signal
-            
-            self.indicators["macd"] = macd
-            self.indicators["macd_signal"] = signal
-            self.indicators["macd_hist"] = histogram
-            
-            # ボリンジャーバンド
-            bb_config = TECHNICAL_INDICATORS["bbands"]
-            period = bb_config["period"]
-            std = bb_config["std"]
-            
-            middle_band = self.data['close'].rolling(window=period).mean()
-            std_dev = self.data['close'].rolling(window=period).std()
-            
-            upper_band = middle_band + (std_dev * std)
-            lower_band = middle_band - (std_dev * std)
-            
-            self.indicators["bb_upper"] = upper_band
-            self.indicators["bb_middle"] = middle_band
-            self.indicators["bb_lower"] = lower_band
-            
-            logger.info(f"Successfully calculated all indicators")
+            # Seriesへの変換は最後にまとめて行う
+            self._arr = values
+            self.indicators = {key: pd.Series(value, index=idx) for key, value in values.items()}
+            self._cache_key = cache_key
+            
+            logger.info("Successfully calculated all indicators")
             return self.indicators
             
         except Exception as e:
-            logger.error(f"Error calculating indicators: {str(e)}")
+            logger.error("Error calculating indicators: %s", e)
             return {}
             
+    def _calculate_fused(self, close_np: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        一括計算カーネルで全指標を1パスで計算
+        
+        Args:
+            close_np: 終値の連続float64配列
+            
+        Returns:
+            Dict[str, np.ndarray]: 指標名ごとの計算結果
+        """
+        n = close_np.shape[0]
+        sma_periods = np.asarray(TECHNICAL_INDICATORS["sma"], dtype=np.int64)
+        ema_periods = np.asarray(TECHNICAL_INDICATORS["ema"], dtype=np.int64)
+        macd_config = TECHNICAL_INDICATORS["macd"]
+        bb_config = TECHNICAL_INDICATORS["bbands"]
+        
+        sma_out = np.empty((sma_periods.shape[0], n))
+        ema_out = np.empty((ema_periods.shape[0], n))
+        single = {key: np.empty(n) for key in (
+            "rsi", "macd", "macd_signal", "macd_hist", "bb_upper", "bb_middle", "bb_lower"
+        )}
+        
+        _compute_all(
+            close_np, sma_periods, ema_periods,
+            TECHNICAL_INDICATORS["rsi"],
+            macd_config["fast"], macd_config["slow"], macd_config["signal"],
+            bb_config["period"], float(bb_config["std"]),
+            sma_out, ema_out,
+            single["rsi"], single["macd"], single["macd_signal"], single["macd_hist"],
+            single["bb_upper"], single["bb_middle"], single["bb_lower"]
+        )
+        
+        values = {}
+        for row, period in enumerate(TECHNICAL_INDICATORS["sma"]):
+            values[f"sma_{period}"] = sma_out[row]
+        for row, period in enumerate(TECHNICAL_INDICATORS["ema"]):
+            values[f"ema_{period}"] = ema_out[row]
+        values.update(single)
+        
+        return values
+        
+    def _calculate_with_talib(self, close_np: np.ndarray, idx: pd.Index) -> Dict[str, np.ndarray]:
+        """
+        TA-Lib（C実装）で各指標を計算（Numba未導入時）
+        指標の定義は一括計算カーネル・pandas版と揃える
+        
+        Args:
+            close_np: 終値の連続float64配列
+            idx: 元データのインデックス
+            
+        Returns:
+            Dict[str, np.ndarray]: 指標名ごとの計算結果
+        """
+        talib = _get_talib()
+        close = pd.Series(close_np, index=idx, copy=False)
+        values = {}
+        
+        # SMA（単純移動平均）
+        for period in TECHNICAL_INDICATORS["sma"]:
+            values[f"sma_{period}"] = talib.SMA(close_np, timeperiod=period)
+            
+        # EMA（指数移動平均）
+        # talib.EMA はSMAで初期化するため、ewm(adjust=False) と同じ定義になるようpandasで計算する
+        for period in TECHNICAL_INDICATORS["ema"]:
+            values[f"ema_{period}"] = close.ewm(span=period, adjust=False).mean().to_numpy()
+            
+        # RSI（相対力指数、Wilder平滑化）
+        values["rsi"] = talib.RSI(close_np, timeperiod=TECHNICAL_INDICATORS["rsi"])
+        
+        # MACD（移動平均収束拡散法、EMAと同じ理由でpandasで計算）
+        macd_config = TECHNICAL_INDICATORS["macd"]
+        exp1 = close.ewm(span=macd_config["fast"], adjust=False).mean()
+        exp2 = close.ewm(span=macd_config["slow"], adjust=False).mean()
+        macd = exp1 - exp2
+        signal = macd.ewm(span=macd_config["signal"], adjust=False).mean()
+        
+        values["macd"] = macd.to_numpy()
+        values["macd_signal"] = signal.to_numpy()
+        values["macd_hist"] = (macd - signal).to_numpy()
+        
+        # ボリンジャーバンド
+        # talib.BBANDS は母標準偏差（ddof=0）のため、倍率を補正して標本標準偏差（ddof=1）に揃える
+        bb_config = TECHNICAL_INDICATORS["bbands"]
+        bb_period = bb_config["period"]
+        nbdev = bb_config["std"] * np.sqrt(bb_period / (bb_period - 1))
+        values["bb_upper"], values["bb_middle"], values["bb_lower"] = talib.BBANDS(
+            close_np,
+            timeperiod=bb_period,
+            nbdevup=nbdev,
+            nbdevdn=nbdev
+        )
+        
+        return values
+        
+    def _calculate_with_pandas(self, close_np: np.ndarray, idx: pd.Index) -> Dict[str, np.ndarray]:
+        """
+        pandasで各指標を計算（Numba・TA-Libともに未導入時のフォールバック）
+        
+        Args:
+            close_np: 終値の連続float64配列
+            idx: 元データのインデックス
+            
+        Returns:
+            Dict[str, np.ndarray]: 指標名ごとの計算結果
+        """
+        close = pd.Series(close_np, index=idx, copy=False)
+        values = {}
+        
+        # SMA（単純移動平均）
+        for period in TECHNICAL_INDICATORS["sma"]:
+            values[f"sma_{period}"] = close.rolling(window=period).mean().to_numpy()
+            
+        # EMA（指数移動平均）
+        for period in TECHNICAL_INDICATORS["ema"]:
+            values[f"ema_{period}"] = close.ewm(span=period, adjust=False).mean().to_numpy()
+            
+        # RSI（相対力指数、Wilder平滑化）
+        period = TECHNICAL_INDICATORS["rsi"]
+        delta = np.diff(close_np, prepend=close_np[0])
+        gain = np.maximum(delta, 0.0)
+        loss = np.maximum(-delta, 0.0)
+        
+        avg_gain = _wilder_mean(gain, period)
+        avg_loss = _wilder_mean(loss, period)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        # 下落のない区間は100とする（一括計算カーネル・TA-Libと同じ）
+        values["rsi"] = np.where(avg_loss == 0.0, 100.0, rsi)
+        
+        # MACD（移動平均収束拡散法）
+        macd_config = TECHNICAL_INDICATORS["macd"]
+        exp1 = close.ewm(span=macd_config["fast"], adjust=False).mean()
+        exp2 = close.ewm(span=macd_config["slow"], adjust=False).mean()
+        macd = exp1 - exp2
+        signal = macd.ewm(span=macd_config["signal"], adjust=False).mean()
+        histogram = macd - signal
+        
+        values["macd"] = macd.to_numpy()
+        values["macd_signal"] = signal.to_numpy()
+        values["macd_hist"] = histogram.to_numpy()
+        
+        # ボリンジャーバンド
+        bb_config = TECHNICAL_INDICATORS["bbands"]
+        period = bb_config["period"]
+        std = bb_config["std"]
+        
+        # 移動合計と移動二乗和でO(N)計算する（桁落ちを抑えるため先頭の終値からの差で集計）
+        offset = close_np[0]
+        shifted = close_np - offset
+        mean = _rolling_mean(shifted, period)
+        mean_sq = _rolling_mean(shifted * shifted, period)
+        # pandasの rolling().std() と同じ標本標準偏差（ddof=1）
+        std_dev = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0) * period / (period - 1))
+        middle_band = mean + offset
+        
+        values["bb_upper"] = middle_band + std_dev * std
+        values["bb_middle"] = middle_band
+        values["bb_lower"] = middle_band - std_dev * std
+        
+        return values
+        
     def generate_signals(self) -> Dict[str, str]:
         """
         各指標のシグナルを生成
@@ -111,19 +471,22 @@ class TechnicalAnalyzer:
         Returns:
             Dict[str, str]: インジケーターごとのシグナル（BUY, SELL, NEUTRAL）
         """
-        if not self.indicators:
-            self.calculate_all_indicators()
+        self.calculate_all_indicators()
             
         if not self.indicators:
             return {}
             
+        # 同じデータで生成済みであれば結果をそのまま返す
+        if self._signals_key == self._cache_key and self.signals:
+            return self.signals
+            
         try:
             signals = {}
             
             # EMAs クロスオーバーシグナル (短期と長期)
             if "ema_9" in self.indicators and "ema_55" in self.indicators:
-                ema_short = self.indicators["ema_9"].iloc[-2:].values
-                ema_long = self.indicators["ema_55"].iloc[-2:].values
+                ema_short = self._arr["ema_9"]
+                ema_long = self._arr["ema_55"]
                 
                 if ema_short[-1] > ema_long[-1] and ema_short[-2] <= ema_long[-2]:
                     signals["ema_cross"] = "BUY"
@@ -134,7 +497,7 @@ class TechnicalAnalyzer:
             
             # RSIシグナル
             if "rsi" in self.indicators:
-                rsi = self.indicators["rsi"].iloc[-1]
+                rsi = self._arr["rsi"][-1]
                 
                 if rsi < 30:
                     signals["rsi"] = "BUY"  # 買われすぎ
@@ -145,8 +508,8 @@ class TechnicalAnalyzer:
             
             # MACDシグナル
             if "macd" in self.indicators and "macd_signal" in self.indicators:
-                macd = self.indicators["macd"].iloc[-2:].values
-                signal = self.indicators["macd_signal"].iloc[-2:].values
+                macd = self._arr["macd"]
+                signal = self._arr["macd_signal"]
                 
                 if macd[-1] > signal[-1] and macd[-2] <= signal[-2]:
                     signals["macd"] = "BUY"  # ゴールデンクロス
@@ -157,9 +520,9 @@ class TechnicalAnalyzer:
             
             # ボリンジャーバンドシグナル
             if all(k in self.indicators for k in ["bb_upper", "bb_middle", "bb_lower"]):
-                close = self.data['close'].iloc[-1]
-                upper = self.indicators["bb_upper"].iloc[-1]
-                lower = self.indicators["bb_lower"].iloc[-1]
+                close = self._close_np[-1]
+                upper = self._arr["bb_upper"][-1]
+                lower = self._arr["bb_lower"][-1]
                 
                 if close < lower:
                     signals["bbands"] = "BUY"  # 下限を下回る（買い）
@@ -180,14 +543,34 @@ class TechnicalAnalyzer:
                 signals["overall"] = "NEUTRAL"
             
             self.signals = signals
-            logger.info(f"Generated signals: {json.dumps(signals)}")
+            self._signals_key = self._cache_key
+            logger.info("Generated signals: %s", signals)
             
             return signals
             
         except Exception as e:
-            logger.error(f"Error generating signals: {str(e)}")
+            logger.error("Error generating signals: %s", e)
             return {"error": str(e)}
     
+    def _latest_sma(self, period: int) -> Optional[float]:
+        """
+        最新のSMA値を取得（計算済みの指標があれば再利用する）
+        
+        Args:
+            period: 期間
+            
+        Returns:
+            Optional[float]: SMA値（データ不足の場合はNone）
+        """
+        if self._close_np.size < period:
+            return None
+            
+        values = self._arr.get(f"sma_{period}")
+        if values is not None:
+            return values[-1]
+            
+        return self._close_np[-period:].mean()
+        
     def get_market_summary(self) -> Dict[str, Any]:
         """
         市場サマリーを取得
@@ -199,19 +582,23 @@ class TechnicalAnalyzer:
             return {}
             
         try:
-            current_price = self.data['close'].iloc[-1]
-            prev_price = self.data['close'].iloc[-2]
+            close_np = self._close_np
+            n = close_np.size
+            
+            current_price = close_np[-1]
+            prev_price = close_np[-2]
             price_change = current_price - prev_price
             price_change_pct = (price_change / prev_price) * 100
             
             # 過去24時間（またはデータフレーム期間）の値動き
-            high_24h = self.data['high'].iloc[-24:].max() if len(self.data) >= 24 else self.data['high'].max()
-            low_24h = self.data['low'].iloc[-24:].min() if len(self.data) >= 24 else self.data['low'].min()
-            volume_24h = self.data['volume'].iloc[-24:].sum() if len(self.data) >= 24 else self.data['volume'].sum()
+            tail = min(n, 24)
+            high_24h = self._high_np[-tail:].max()
+            low_24h = self._low_np[-tail:].min()
+            volume_24h = self._vol_np[-tail:].sum()
             
             # トレンド判定
-            sma20 = self.data['close'].rolling(window=20).mean().iloc[-1] if len(self.data) >= 20 else None
-            sma50 = self.data['close'].rolling(window=50).mean().iloc[-1] if len(self.data) >= 50 else None
+            sma20 = self._latest_sma(20)
+            sma50 = self._latest_sma(50)
             
             if sma20 and sma50:
                 if current_price > sma20 > sma50:
@@ -236,28 +623,37 @@ class TechnicalAnalyzer:
             }
             
         except Exception as e:
-            logger.error(f"Error generating market summary: {str(e)}")
+            logger.error("Error generating market summary: %s", e)
             return {"error": str(e)}
     
-    def analyze_timeframe(self, timeframe: str) -> Dict[str, Any]:
+    def analyze_timeframe(self, timeframe: str, ohlcv_data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """
         特定のタイムフレームの分析結果を取得
         
         Args:
             timeframe: 分析対象のタイムフレーム
+            ohlcv_data: 分析するOHLCV データフレーム（指定しない場合は設定済みのデータを使用）
             
         Returns:
             Dict[str, Any]: 分析結果
         """
+        if ohlcv_data is not None:
+            self.set_data(ohlcv_data)
+            
         self.calculate_all_indicators()
         signals = self.generate_signals()
         summary = self.get_market_summary()
         
-        # 最後の数値を取り出す
+        # 最後の数値をまとめて取り出して丸める（NaNの指標は除外）
         last_indicators = {}
-        for name, series in self.indicators.items():
-            if not series.empty:
-                last_indicators[name] = round(series.iloc[-1], 2)
+        if self._arr and self._close_np is not None and len(self._close_np) > 0:
+            names = list(self._arr.keys())
+            last_values = np.fromiter((self._arr[name][-1] for name in names), dtype=np.float64, count=len(names))
+            rounded = np.round(last_values, 2)
+            valid = ~np.isnan(rounded)
+            last_indicators = {
+                name: value for name, value, is_valid in zip(names, rounded.tolist(), valid) if is_valid
+            }
         
         return {
             "timeframe": timeframe,
@@ -265,3 +661,45 @@ class TechnicalAnalyzer:
             "indicators": last_indicators,
             "summary": summary
         }
+
+
+def _analyze_one(ohlcv_data: pd.DataFrame, timeframe: str) -> Dict[str, Any]:
+    """
+    1つのタイムフレームを分析する（ワーカースレッドから呼び出す）
+    スレッド間で状態を共有しないよう、呼び出しごとに新しいアナライザーを生成する
+    
+    Args:
+        ohlcv_data: OHLCV データフレーム
+        timeframe: 分析対象のタイムフレーム
+        
+    Returns:
+        Dict[str, Any]: 分析結果
+    """
+    return TechnicalAnalyzer().analyze_timeframe(timeframe, ohlcv_data)
+
+
+def analyze_timeframes(timeframe_data: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+    """
+    複数のタイムフレームを並列に分析する
+    指標計算のNumbaカーネルはGILを解放するため、プロセス生成やデータのピクルを伴わないスレッドで分担する
+    
+    Args:
+        timeframe_data: タイムフレームごとのOHLCVデータ
+        
+    Returns:
+        Dict[str, Dict[str, Any]]: タイムフレームごとの分析結果
+    """
+    if not timeframe_data:
+        return {}
+        
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(timeframe_data)) as executor:
+        futures = {
+            executor.submit(_analyze_one, ohlcv_data, timeframe): timeframe
+            for timeframe, ohlcv_data in timeframe_data.items()
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            
+    # 完了順ではなく入力のタイムフレーム順で返す
+    return {timeframe: results[timeframe] for timeframe in timeframe_data}
@@ -17,6 +17,10 @@ ROOT_DIR = Path(__file__).parent.parent
 LOG_DIR = ROOT_DIR / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
+# OHLCVキャッシュディレクトリ
+CACHE_DIR = ROOT_DIR / "cache"
+CACHE_DIR.mkdir(exist_ok=True)
+
 # APIキー
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
@@ -1,16 +1,18 @@
 """
 価格データ取得モジュール
 """
-import ccxt
+import asyncio
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union, Any
 import time
 import os
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from .utils.logger import setup_logger
-from .config import DEFAULT_SYMBOL
+from .config import DEFAULT_SYMBOL, CACHE_DIR
 
 logger = setup_logger("data_fetcher")
 
@@ -20,6 +22,14 @@ class DataFetcher:
     # フォールバック用の取引所リスト
     FALLBACK_EXCHANGES = ["kraken", "coinbase", "kucoin", "bybit"]
     
+    # タイムフレームごとの取得データ量
+    TIMEFRAME_LIMITS = {
+        '1d': 200,  # 約200日分
+        '4h': 500,  # 約83日分
+        '1h': 500,  # 約20日分
+    }
+    DEFAULT_LIMIT = 500  # 短期間のタイムフレーム
+    
     def __init__(self, exchange_id: str = "kraken", symbol: str = DEFAULT_SYMBOL):
         """
         初期化
@@ -33,30 +43,40 @@ class DataFetcher:
         self.exchange = None
         self._initialize_exchange()
         
+    def _exchange_config(self) -> Dict[str, Any]:
+        """
+        取引所インスタンスの生成に使うAPI設定を作成
+        
+        Returns:
+            Dict[str, Any]: ccxtの取引所設定
+        """
+        config = {
+            'enableRateLimit': True,  # レート制限を有効化
+        }
+        
+        # 取引所に応じたAPIキー設定
+        if self.exchange_id.lower() == 'bybit':
+            api_key = os.getenv('BYBIT_API_KEY')
+            api_secret = os.getenv('BYBIT_API_SECRET')
+            
+            if api_key and api_secret:
+                config['apiKey'] = api_key
+                config['secret'] = api_secret
+                logger.info(f"Bybit API credentials loaded successfully")
+            else:
+                logger.warning(f"Bybit API credentials not found in environment variables")
+                
+        return config
+        
     def _initialize_exchange(self) -> None:
         """取引所APIを初期化"""
+        # ccxtは読み込みに時間がかかるため、取引所の初期化時に読み込む
+        import ccxt
+        
         try:
             # ccxtライブラリで取引所インスタンスを作成
             exchange_class = getattr(ccxt, self.exchange_id)
-            
-            # API設定を作成
-            config = {
-                'enableRateLimit': True,  # レート制限を有効化
-            }
-            
-            # 取引所に応じたAPIキー設定
-            if self.exchange_id.lower() == 'bybit':
-                api_key = os.getenv('BYBIT_API_KEY')
-                api_secret = os.getenv('BYBIT_API_SECRET')
-                
-                if api_key and api_secret:
-                    config['apiKey'] = api_key
-                    config['secret'] = api_secret
-                    logger.info(f"Bybit API credentials loaded successfully")
-                else:
-                    logger.warning(f"Bybit API credentials not found in environment variables")
-            
-            self.exchange = exchange_class(config)
+            self.exchange = exchange_class(self._exchange_config())
             logger.info(f"Exchange {self.exchange_id} initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize exchange {self.exchange_id}: {str(e)}")
@@ -80,6 +100,19 @@ class DataFetcher:
             return df
             
         # 現在の取引所が失敗した場合、フォールバック取引所を試す
+        return self._fetch_from_fallback_exchanges(timeframe, limit)
+        
+    def _fetch_from_fallback_exchanges(self, timeframe: str, limit: int) -> pd.DataFrame:
+        """
+        フォールバック取引所を順に試してデータを取得する
+        
+        Args:
+            timeframe: 時間枠
+            limit: 取得するデータ点の数
+            
+        Returns:
+            pd.DataFrame: OHLCV データ（すべて失敗した場合は空）
+        """
         logger.warning(f"{self.exchange_id} failed. Trying fallback exchanges...")
         
         for fallback_exchange in self.FALLBACK_EXCHANGES:
@@ -122,24 +155,28 @@ class DataFetcher:
         if not self.exchange:
             self._initialize_exchange()
             
+        import ccxt
+        
         try:
             # 3回までリトライ
             for attempt in range(3):
                 try:
-                    logger.info(f"Fetching {timeframe} OHLCV data for {self.symbol} from {exchange_id}")
-                    ohlcv = self.exchange.fetch_ohlcv(self.symbol, timeframe, limit=limit)
+                    # キャッシュがあれば最終ローソク足以降の差分のみを取得
+                    cached = self._load_cached_ohlcv(exchange_id, timeframe, limit)
+                    since = int(cached.index[-1].value // 1_000_000) if cached is not None else None
                     
-                    # DataFrameに変換
-                    df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                    
-                    # Unix timestamp をdatetimeに変換
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                    
-                    # インデックスを設定
-                    df.set_index('timestamp', inplace=True)
+                    logger.info(f"Fetching {timeframe} OHLCV data for {self.symbol} from {exchange_id}")
+                    ohlcv = self.exchange.fetch_ohlcv(self.symbol, timeframe, since=since, limit=limit)
+                    df = self._ohlcv_to_dataframe(ohlcv)
                     
                     logger.info(f"Successfully fetched {len(df)} {timeframe} candles from {exchange_id}")
                     
+                    if cached is not None:
+                        # 確定前だった最終ローソク足は新しい値で置き換える
+                        df = pd.concat([cached, df])
+                        df = df[~df.index.duplicated(keep='last')].iloc[-limit:]
+                        
+                    self._save_cached_ohlcv(exchange_id, timeframe, df)
                     return df
                 except ccxt.NetworkError as e:
                     if attempt < 2:  # 2回目までは再試行
@@ -153,6 +190,95 @@ class DataFetcher:
             # エラー時は空のDataFrameを返す
             return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
     
+    def _cache_path(self, exchange_id: str, timeframe: str) -> Path:
+        """
+        OHLCVキャッシュファイルのパスを取得する
+        
+        Args:
+            exchange_id: 取引所ID
+            timeframe: 時間枠
+            
+        Returns:
+            Path: キャッシュファイルのパス
+        """
+        return CACHE_DIR / f"{exchange_id}_{self.symbol.replace('/', '_')}_{timeframe}.parquet"
+        
+    def _load_cached_ohlcv(self, exchange_id: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
+        """
+        差分取得に利用できるキャッシュ済みOHLCVデータを読み込む
+        
+        Args:
+            exchange_id: 取引所ID
+            timeframe: 時間枠
+            limit: 取得するデータ点の数
+            
+        Returns:
+            Optional[pd.DataFrame]: キャッシュデータ（利用できない場合はNone）
+        """
+        path = self._cache_path(exchange_id, timeframe)
+        if not path.exists():
+            return None
+            
+        try:
+            cached = pd.read_parquet(path, engine='pyarrow')
+        except Exception as e:
+            logger.warning(f"Failed to read OHLCV cache {path.name}: {str(e)}")
+            return None
+            
+        if len(cached) < limit:
+            return None
+            
+        # 差分が limit 本を超える古いキャッシュは全件取得し直す
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        last_ms = cached.index[-1].value // 1_000_000
+        if self.exchange.milliseconds() - last_ms >= (limit - 1) * timeframe_ms:
+            return None
+            
+        return cached
+        
+    def _save_cached_ohlcv(self, exchange_id: str, timeframe: str, df: pd.DataFrame) -> None:
+        """
+        OHLCVデータをキャッシュに保存する
+        
+        Args:
+            exchange_id: 取引所ID
+            timeframe: 時間枠
+            df: OHLCV データ
+        """
+        if df.empty:
+            return
+            
+        path = self._cache_path(exchange_id, timeframe)
+        try:
+            df.to_parquet(path, engine='pyarrow')
+        except Exception as e:
+            logger.warning(f"Failed to write OHLCV cache {path.name}: {str(e)}")
+            
+    @staticmethod
+    def _ohlcv_to_dataframe(ohlcv: List[List[float]]) -> pd.DataFrame:
+        """
+        ccxt形式のOHLCVリストをDataFrameに変換する
+        
+        Args:
+            ohlcv: [timestamp, open, high, low, close, volume] のリスト
+            
+        Returns:
+            pd.DataFrame: timestampをインデックスとするOHLCV データ
+        """
+        # 行ごとの型推論を避けるため、一度にfloat64配列へ変換してから列を切り出す
+        arr = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+        
+        # Unix timestamp をdatetimeに変換
+        index = pd.DatetimeIndex(pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms'), name='timestamp')
+        
+        return pd.DataFrame({
+            'open': arr[:, 1],
+            'high': arr[:, 2],
+            'low': arr[:, 3],
+            'close': arr[:, 4],
+            'volume': arr[:, 5],
+        }, index=index)
+        
     def fetch_multi_timeframe_data(self, timeframes: List[str]) -> Dict[str, pd.DataFrame]:
         """
         複数のタイムフレームのデータを取得
@@ -163,24 +289,121 @@ class DataFetcher:
         Returns:
             Dict[str, pd.DataFrame]: タイムフレームごとのOHLCVデータ
         """
-        result = {}
+        if not timeframes:
+            return {}
+            
+        # タイムフレームに応じてデータ量を調整
+        limits = {tf: self.TIMEFRAME_LIMITS.get(tf, self.DEFAULT_LIMIT) for tf in timeframes}
         
+        # 現在の取引所から全タイムフレームを並列に取得（各リクエストは独立したI/O待ち）
+        exchange_id = self.exchange_id
+        with ThreadPoolExecutor(max_workers=len(timeframes)) as executor:
+            futures = {
+                tf: executor.submit(self._try_fetch_from_exchange, exchange_id, tf, limits[tf])
+                for tf in timeframes
+            }
+            fetched = {tf: future.result() for tf, future in futures.items()}
+            
+        result = {}
         for tf in timeframes:
-            # タイムフレームに応じてデータ量を調整
-            if tf == '1d':
-                limit = 200  # 約200日分
-            elif tf == '4h':
-                limit = 500  # 約83日分
-            elif tf == '1h':
-                limit = 500  # 約20日分
-            else:  # 短期間のタイムフレーム
-                limit = 500
-                
-            df = self.fetch_ohlcv(tf, limit)
+            df = fetched[tf]
+            if df.empty:
+                # フォールバックは取引所インスタンスを切り替えるため逐次実行する
+                df = self._fetch_from_fallback_exchanges(tf, limits[tf])
             if not df.empty:
                 result[tf] = df
                 
         return result
+        
+    async def fetch_multi_timeframe_data_async(self, timeframes: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        複数のタイムフレームのデータを非同期に取得
+        1つの ccxt.async_support の取引所インスタンスから全タイムフレームを同時にリクエストし、
+        取得に失敗したタイムフレームはREST APIのフォールバックで取得する
+        
+        Args:
+            timeframes: タイムフレームのリスト
+            
+        Returns:
+            Dict[str, pd.DataFrame]: タイムフレームごとのOHLCVデータ
+        """
+        if not timeframes:
+            return {}
+            
+        import ccxt.async_support as ccxt_async
+        
+        loop = asyncio.get_running_loop()
+        exchange_id = self.exchange_id
+        exchange = getattr(ccxt_async, exchange_id)(self._exchange_config())
+        
+        try:
+            fetched = await asyncio.gather(
+                *(self._fetch_ohlcv_async(
+                    exchange, exchange_id, tf, self.TIMEFRAME_LIMITS.get(tf, self.DEFAULT_LIMIT)
+                ) for tf in timeframes),
+                return_exceptions=True
+            )
+        finally:
+            await exchange.close()
+            
+        result = {}
+        for tf, df in zip(timeframes, fetched):
+            if isinstance(df, Exception):
+                logger.error(f"Error fetching {tf} OHLCV data from {exchange_id}: {df!r}")
+                continue
+            if not df.empty:
+                result[tf] = df
+                
+        # 取得できなかったタイムフレームは同期版（フォールバック取引所を含む）で取得
+        failed = [tf for tf in timeframes if tf not in result]
+        if failed:
+            rest_data = await loop.run_in_executor(None, self.fetch_multi_timeframe_data, failed)
+            result.update(rest_data)
+            
+        return {tf: result[tf] for tf in timeframes if tf in result}
+        
+    async def _fetch_ohlcv_async(self, exchange: Any, exchange_id: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """
+        非同期の取引所インスタンスからOHLCVデータを取得する
+        
+        Args:
+            exchange: ccxt.async_support の取引所インスタンス
+            exchange_id: 取引所ID
+            timeframe: 時間枠
+            limit: 取得するデータ点の数
+            
+        Returns:
+            pd.DataFrame: OHLCV データ
+        """
+        import ccxt
+        
+        # キャッシュがあれば最終ローソク足以降の差分のみを取得
+        cached = self._load_cached_ohlcv(exchange_id, timeframe, limit)
+        since = int(cached.index[-1].value // 1_000_000) if cached is not None else None
+        
+        # 3回までリトライ
+        for attempt in range(3):
+            try:
+                logger.info(f"Fetching {timeframe} OHLCV data for {self.symbol} from {exchange_id}")
+                ohlcv = await exchange.fetch_ohlcv(self.symbol, timeframe, since=since, limit=limit)
+                break
+            except ccxt.NetworkError as e:
+                if attempt < 2:  # 2回目までは再試行
+                    logger.warning(f"Network error with {exchange_id}: {str(e)}. Retrying in 2 seconds...")
+                    await asyncio.sleep(2)
+                else:
+                    raise
+                    
+        df = self._ohlcv_to_dataframe(ohlcv)
+        logger.info(f"Successfully fetched {len(df)} {timeframe} candles from {exchange_id}")
+        
+        if cached is not None:
+            # 確定前だった最終ローソク足は新しい値で置き換える
+            df = pd.concat([cached, df])
+            df = df[~df.index.duplicated(keep='last')].iloc[-limit:]
+            
+        self._save_cached_ohlcv(exchange_id, timeframe, df)
+        return df
     
     def get_current_price(self) -> float:
         """
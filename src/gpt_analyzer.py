@@ -2,19 +2,68 @@
 GPTを活用したトレード分析モジュール
 """
 import json
-import time
+import re
+import asyncio
 import os
-from typing import Dict, List, Any, Optional
-import openai
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 
 from .utils.logger import setup_logger
 from .config import OPENAI_API_KEY
 
+if TYPE_CHECKING:
+    import openai
+
 logger = setup_logger("gpt_analyzer")
 
+# 分析テキストの各セクション（全角コロンにも対応）
+_SECTION_RE = re.compile(r'^[ \t]*(判断|見通し|根拠|注意点)[:：][ \t]*(.*)$', re.M)
+_SECTION_KEYS = {
+    "判断": "judgment",
+    "見通し": "outlook",
+    "根拠": "reasoning",
+    "注意点": "advice"
+}
+
 class GPTAnalyzer:
     """ChatGPT Turboを活用した市場分析を行うクラス"""
     
+    # プロンプトの固定部分（毎回同じ先頭部分を送ることでAPI側のプロンプトキャッシュが効く）
+    _SYSTEM_PROMPT = "あなたはプロのトレーダーで、暗号資産市場の分析を行います。"
+    
+    _HEADER_TMPL = """あなたは暗号資産のトレードアドバイザーです。以下の{timeframe}時間足のビットコイン（BTC/USDT）の市場データを分析し、簡潔なトレード判断を日本語で提供してください。
+
+"""
+    
+    _BATCH_HEADER_TMPL = """あなたは暗号資産のトレードアドバイザーです。以下のビットコイン（BTC/USDT）の各時間足（{timeframes}）の市場データを分析し、時間足ごとに簡潔なトレード判断を日本語で提供してください。
+"""
+    
+    _MARKET_DATA_TMPL = """【市場データ】
+- 現在価格: {current_price} USDT
+- 価格変動: {price_change} USDT ({price_change_pct:.2f}%)
+- 全体トレンド: {trend}
+
+【テクニカル指標】
+"""
+    
+    _FOOTER = """
+以上のデータに基づいて、現在のトレード判断（強い買い、弱い買い、中立、弱い売り、強い売り）とその理由を3-4行程度で簡潔に説明してください。
+特に重要な指標や、短期・中期の見通しについて言及してください。
+必ず以下のフォーマットで回答してください：
+
+判断: [強い買い/弱い買い/中立/弱い売り/強い売り]
+見通し: [100文字以内の簡潔な市場分析]
+根拠: [100文字以内のテクニカル指標に基づく根拠]
+注意点: [トレーダーへの簡潔なアドバイス]
+"""
+    
+    _BATCH_FOOTER = """
+以上のデータに基づいて、時間足ごとに現在のトレード判断（強い買い、弱い買い、中立、弱い売り、強い売り）とその理由を簡潔に説明してください。
+特に重要な指標や、短期・中期の見通しについて言及してください。
+必ず以下のJSON形式で、時間足をキーとして回答してください：
+
+{"<時間足>": {"judgment": "[強い買い/弱い買い/中立/弱い売り/強い売り]", "outlook": "[100文字以内の簡潔な市場分析]", "reasoning": "[100文字以内のテクニカル指標に基づく根拠]", "advice": "[トレーダーへの簡潔なアドバイス]"}}
+"""
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         初期化
@@ -24,16 +73,53 @@ class GPTAnalyzer:
         """
         self.api_key = api_key or OPENAI_API_KEY
         
-        # OpenAI APIキーを設定
-        openai.api_key = self.api_key
-        
         # プロキシ設定（必要な場合）
-        proxy = os.environ.get('OPENAI_PROXY')
-        if proxy:
-            logger.info(f"Using proxy: {proxy}")
-            openai.proxy = proxy
+        self.proxy = os.environ.get('OPENAI_PROXY')
+        if self.proxy:
+            logger.info(f"Using proxy: {self.proxy}")
         else:
             logger.info("No proxy configuration found. Set OPENAI_PROXY environment variable if needed.")
+            
+    def _create_client(self) -> "openai.AsyncOpenAI":
+        """
+        OpenAI の非同期クライアントを作成する
+        接続プールはイベントループに紐づくため、asyncio.run の呼び出しごとに作成する
+        
+        Returns:
+            openai.AsyncOpenAI: 非同期クライアント
+        """
+        # openaiは読み込みに時間がかかるため、API呼び出し時に読み込む
+        import openai
+        
+        http_client = openai.DefaultAsyncHttpxClient(proxy=self.proxy) if self.proxy else None
+        return openai.AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+        
+    def _format_market_data(self, market_data: Dict[str, Any]) -> str:
+        """
+        市場データと指標をプロンプト用のテキストに整形する
+        
+        Args:
+            market_data: 市場データと指標
+            
+        Returns:
+            str: 整形されたデータ部分
+        """
+        # データを抽出して読みやすくフォーマット
+        summary = market_data.get("summary", {})
+        
+        indicators_text = "".join(
+            f"- {name}: {value}\n" for name, value in market_data.get("indicators", {}).items()
+        )
+        signals_text = "".join(
+            f"- {name}: {signal}\n" for name, signal in market_data.get("signals", {}).items()
+        )
+        
+        return self._MARKET_DATA_TMPL.format(
+            current_price=summary.get("current_price", "N/A"),
+            price_change=summary.get("price_change", "N/A"),
+            price_change_pct=summary.get("price_change_pct", "N/A"),
+            trend=summary.get("trend", "不明")
+        ) + indicators_text + "\n【シグナル】\n" + signals_text
         
     def _create_prompt(self, market_data: Dict[str, Any], timeframe: str) -> str:
         """
@@ -46,48 +132,120 @@ class GPTAnalyzer:
         Returns:
             str: 構築されたプロンプト
         """
-        # データを抽出して読みやすくフォーマット
-        current_price = market_data.get("summary", {}).get("current_price", "N/A")
-        price_change = market_data.get("summary", {}).get("price_change", "N/A")
-        price_change_pct = market_data.get("summary", {}).get("price_change_pct", "N/A")
-        trend = market_data.get("summary", {}).get("trend", "不明")
-        
-        signals = market_data.get("signals", {})
-        indicators = market_data.get("indicators", {})
+        return self._HEADER_TMPL.format(timeframe=timeframe) + self._format_market_data(market_data) + self._FOOTER
         
-        prompt = f"""あなたは暗号資産のトレードアドバイザーです。以下の{timeframe}時間足のビットコイン（BTC/USDT）の市場データを分析し、簡潔なトレード判断を日本語で提供してください。
-
-【市場データ】
-- 現在価格: {current_price} USDT
-- 価格変動: {price_change} USDT ({price_change_pct:.2f}%)
-- 全体トレンド: {trend}
-
-【テクニカル指標】
-"""
+    def _create_batch_prompt(self, all_market_data: Dict[str, Dict[str, Any]]) -> str:
+        """
+        全タイムフレームをまとめて分析するプロンプトを作成する
         
-        # 指標情報を追加
-        for name, value in indicators.items():
-            prompt += f"- {name}: {value}\n"
+        Args:
+            all_market_data: タイムフレームごとの市場データ
             
-        prompt += "\n【シグナル】\n"
+        Returns:
+            str: 構築されたプロンプト
+        """
+        sections = "".join(
+            f"\n=== {timeframe}時間足 ===\n" + self._format_market_data(market_data)
+            for timeframe, market_data in all_market_data.items()
+        )
+        header = self._BATCH_HEADER_TMPL.format(timeframes=", ".join(all_market_data.keys()))
+        return header + sections + self._BATCH_FOOTER
+        
+    def _error_result(self, error: str) -> Dict[str, str]:
+        """
+        API呼び出し失敗時の分析結果を作成する
         
-        # シグナル情報を追加
-        for name, signal in signals.items():
-            prompt += f"- {name}: {signal}\n"
+        Args:
+            error: エラー内容
             
-        prompt += """
-以上のデータに基づいて、現在のトレード判断（強い買い、弱い買い、中立、弱い売り、強い売り）とその理由を3-4行程度で簡潔に説明してください。
-特に重要な指標や、短期・中期の見通しについて言及してください。
-必ず以下のフォーマットで回答してください：
-
-判断: [強い買い/弱い買い/中立/弱い売り/強い売り]
-見通し: [100文字以内の簡潔な市場分析]
-根拠: [100文字以内のテクニカル指標に基づく根拠]
-注意点: [トレーダーへの簡潔なアドバイス]
-"""
+        Returns:
+            Dict[str, str]: エラーを示す分析結果
+        """
+        return {
+            "error": error,
+            "judgment": "エラー",
+            "outlook": "API呼び出し中にエラーが発生しました",
+            "reasoning": error,
+            "advice": "しばらく待ってから再試行してください"
+        }
+        
+    def _api_key_error_result(self) -> Dict[str, str]:
+        """
+        APIキー未設定時の分析結果を作成する
+        
+        Returns:
+            Dict[str, str]: エラーを示す分析結果
+        """
+        return {
+            "error": "APIキーが設定されていません",
+            "judgment": "エラー",
+            "outlook": "APIキーが設定されていないため分析できません",
+            "reasoning": "",
+            "advice": "環境変数 OPENAI_API_KEY を設定してください"
+        }
         
-        return prompt
+    async def _request_completion(self, client: "openai.AsyncOpenAI", prompt: str, max_tokens: int, **kwargs: Any) -> str:
+        """
+        ChatCompletion API を呼び出して応答テキストを取得する（3回までリトライ）
         
+        Args:
+            client: 非同期クライアント
+            prompt: ユーザープロンプト
+            max_tokens: 回答の長さ制限
+            **kwargs: API呼び出しの追加パラメータ
+            
+        Returns:
+            str: 応答テキスト
+        """
+        for attempt in range(3):
+            try:
+                response = await client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": self._SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.5,  # 創造性と一貫性のバランス
+                    max_tokens=max_tokens,
+                    **kwargs
+                )
+                return response.choices[0].message.content.strip()
+                
+            except Exception as e:
+                if attempt < 2:  # 2回目までは再試行
+                    logger.warning(f"API error: {str(e)}. Retrying in 2 seconds...")
+                    await asyncio.sleep(2)
+                else:
+                    raise
+                    
+    async def _analyze_market_async(self, client: "openai.AsyncOpenAI", market_data: Dict[str, Any], timeframe: str) -> Dict[str, str]:
+        """
+        1つのタイムフレームをGPTで分析する
+        
+        Args:
+            client: 非同期クライアント
+            market_data: 市場データと指標
+            timeframe: タイムフレーム
+            
+        Returns:
+            Dict[str, str]: GPTによる分析結果
+        """
+        try:
+            prompt = self._create_prompt(market_data, timeframe)
+            
+            logger.info(f"Sending request to OpenAI API for {timeframe} analysis")
+            analysis_text = await self._request_completion(client, prompt, max_tokens=300)
+            
+            # 分析テキストをパースして構造化
+            result = self._parse_analysis(analysis_text)
+            
+            logger.info(f"Successfully received GPT analysis for {timeframe}")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error analyzing market with GPT: {str(e)}")
+            return self._error_result(str(e))
+            
     def analyze_market(self, market_data: Dict[str, Any], timeframe: str) -> Dict[str, str]:
         """
         市場データをGPTで分析し、トレード判断を取得する
@@ -101,57 +259,13 @@ class GPTAnalyzer:
         """
         if not self.api_key:
             logger.error("OpenAI API key is not configured")
-            return {
-                "error": "APIキーが設定されていません",
-                "judgment": "エラー",
-                "outlook": "APIキーが設定されていないため分析できません",
-                "reasoning": "",
-                "advice": "環境変数 OPENAI_API_KEY を設定してください"
-            }
+            return self._api_key_error_result()
             
-        prompt = self._create_prompt(market_data, timeframe)
-        
-        try:
-            # 3回までリトライ
-            for attempt in range(3):
-                try:
-                    logger.info(f"Sending request to OpenAI API for {timeframe} analysis")
-                    
-                    response = openai.ChatCompletion.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": "あなたはプロのトレーダーで、暗号資産市場の分析を行います。"},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.5,  # 創造性と一貫性のバランス
-                        max_tokens=300,   # 回答の長さ制限
-                    )
-                    
-                    # レスポンスからテキスト部分を抽出
-                    analysis_text = response.choices[0].message['content'].strip()
-                    
-                    # 分析テキストをパースして構造化
-                    result = self._parse_analysis(analysis_text)
-                    
-                    logger.info(f"Successfully received GPT analysis for {timeframe}")
-                    return result
-                    
-                except Exception as e:
-                    if attempt < 2:  # 2回目までは再試行
-                        logger.warning(f"API error: {str(e)}. Retrying in 2 seconds...")
-                        time.sleep(2)
-                    else:
-                        raise
-            
-        except Exception as e:
-            logger.error(f"Error analyzing market with GPT: {str(e)}")
-            return {
-                "error": str(e),
-                "judgment": "エラー",
-                "outlook": "API呼び出し中にエラーが発生しました",
-                "reasoning": str(e),
-                "advice": "しばらく待ってから再試行してください"
-            }
+        async def run() -> Dict[str, str]:
+            async with self._create_client() as client:
+                return await self._analyze_market_async(client, market_data, timeframe)
+                
+        return asyncio.run(run())
     
     def _parse_analysis(self, analysis_text: str) -> Dict[str, str]:
         """
@@ -170,24 +284,9 @@ class GPTAnalyzer:
             "advice": ""
         }
         
-        try:
-            # 行ごとに分割して各セクションを解析
-            lines = analysis_text.strip().split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith("判断:"):
-                    result["judgment"] = line[3:].strip()
-                elif line.startswith("見通し:"):
-                    result["outlook"] = line[4:].strip()
-                elif line.startswith("根拠:"):
-                    result["reasoning"] = line[3:].strip()
-                elif line.startswith("注意点:"):
-                    result["advice"] = line[4:].strip()
-            
-        except Exception as e:
-            logger.error(f"Error parsing GPT analysis: {str(e)}")
-            result["error"] = f"分析テキストのパースに失敗しました: {str(e)}"
+        # 1回の走査で各セクションを抽出
+        for match in _SECTION_RE.finditer(analysis_text):
+            result[_SECTION_KEYS[match.group(1)]] = match.group(2).strip()
             
         return result
         
@@ -201,12 +300,58 @@ class GPTAnalyzer:
         Returns:
             Dict[str, Dict[str, str]]: タイムフレームごとの分析結果
         """
-        results = {}
+        if not all_market_data:
+            return {}
+            
+        if not self.api_key:
+            logger.error("OpenAI API key is not configured")
+            return {timeframe: self._api_key_error_result() for timeframe in all_market_data}
+            
+        return asyncio.run(self._analyze_multi_timeframe_async(all_market_data))
+        
+    async def _analyze_multi_timeframe_async(self, all_market_data: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+        """
+        全タイムフレームを1回のAPI呼び出しで分析し、取得できなかった分のみ個別に並行して分析する
         
-        for timeframe, market_data in all_market_data.items():
-            analysis = self.analyze_market(market_data, timeframe)
-            results[timeframe] = analysis
-            # APIレート制限を考慮して短い待機時間を挟む
-            time.sleep(1)
+        Args:
+            all_market_data: タイムフレームごとの市場データ
             
-        return results
+        Returns:
+            Dict[str, Dict[str, str]]: タイムフレームごとの分析結果
+        """
+        results = {}
+        
+        async with self._create_client() as client:
+            try:
+                logger.info(f"Sending batched request to OpenAI API for {len(all_market_data)} timeframes")
+                response_text = await self._request_completion(
+                    client,
+                    self._create_batch_prompt(all_market_data),
+                    max_tokens=300 * len(all_market_data),
+                    response_format={"type": "json_object"}
+                )
+                batch = json.loads(response_text)
+                
+                for timeframe in all_market_data:
+                    analysis = batch.get(timeframe) if isinstance(batch, dict) else None
+                    if isinstance(analysis, dict):
+                        results[timeframe] = {
+                            "judgment": str(analysis.get("judgment", "不明")),
+                            "outlook": str(analysis.get("outlook", "")),
+                            "reasoning": str(analysis.get("reasoning", "")),
+                            "advice": str(analysis.get("advice", ""))
+                        }
+                        
+                logger.info(f"Successfully received batched GPT analysis for {len(results)} timeframes")
+            except Exception as e:
+                logger.warning(f"Batched GPT analysis failed: {str(e)}. Falling back to per-timeframe requests")
+                
+            # 一括分析で取得できなかったタイムフレームは個別に並行して分析
+            missing = [timeframe for timeframe in all_market_data if timeframe not in results]
+            if missing:
+                analyses = await asyncio.gather(
+                    *(self._analyze_market_async(client, all_market_data[timeframe], timeframe) for timeframe in missing)
+                )
+                results.update(zip(missing, analyses))
+                
+        return {timeframe: results[timeframe] for timeframe in all_market_data}
@@ -4,14 +4,15 @@ TRANDアプリケーションのメインモジュール
 import os
 import sys
 import time
-import schedule
+import heapq
+import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple
 
 from .config import TRADING_INTERVALS, NOTIFICATION_TIMES, validate_config
 from .data_fetcher import DataFetcher
-from .analyzer import TechnicalAnalyzer
+from .analyzer import analyze_timeframes
 from .gpt_analyzer import GPTAnalyzer
 from .notifier import DiscordNotifier
 from .utils.logger import setup_logger
@@ -19,48 +20,94 @@ from .utils.time_utils import get_current_utc_time, determine_current_session, i
 
 logger = setup_logger("main")
 
+# テクニカル指標の総合シグナルから判断への対応（該当しない場合は「中立」）
+_SIGNAL_JUDGMENT: Dict[str, str] = {
+    "STRONG_BUY": "強い買い",
+    "BUY": "弱い買い",
+    "SELL": "弱い売り",
+    "STRONG_SELL": "強い売り",
+}
+_DEFAULT_JUDGMENT = "中立"
+
+# GPT分析が利用できない場合のフォールバック文言
+_FALLBACK_OUTLOOK_TMPL = "{timeframe}のトレンドは{trend}です。GPT分析は利用できません。"
+_FALLBACK_REASONING = "技術的指標のみに基づく判断です。"
+_FALLBACK_ADVICE = "詳細な分析はできませんが、テクニカル指標の総合判断に従ってください。"
+
 class TradingBot:
     """メインのトレーディングボットクラス"""
     
+    # 同じ分の中での再実行時に分析結果を使い回す期間（秒）
+    ANALYSIS_CACHE_TTL = 55
+    
     def __init__(self):
         """初期化"""
         self.data_fetcher = DataFetcher(exchange_id="bybit", symbol="BTC/USDT")
-        self.tech_analyzer = TechnicalAnalyzer()
         self.gpt_analyzer = GPTAnalyzer()
         self.notifier = DiscordNotifier()
+        # 次回の通知時刻（UNIXタイムスタンプ）のヒープ
+        self._schedule_heap: List[float] = []
+        # (通貨ペア, タイムフレーム, 分単位の時刻) -> (作成時刻, 分析結果)
+        self._analysis_cache: Dict[Tuple[str, Tuple[str, ...], int], Tuple[float, Dict[str, Any]]] = {}
+        # 前回GPT分析したテクニカル分析のシグネチャと、成功したタイムフレームの結果
+        self._last_tech_hash: Optional[int] = None
+        self._last_gpt: Dict[str, Any] = {}
         
     def run_analysis(self) -> Dict[str, Any]:
         """
         すべてのタイムフレームの分析を実行
+        同じ分の中で再度呼ばれた場合は、データ取得と分析をやり直さずに前回の結果を返す
         
         Returns:
             Dict[str, Any]: 分析結果と技術分析データ
         """
+        now = time.time()
+        cache_key = (self.data_fetcher.symbol, tuple(TRADING_INTERVALS), int(now // 60))
+        cached = self._analysis_cache.get(cache_key)
+        if cached and now - cached[0] < self.ANALYSIS_CACHE_TTL:
+            logger.info("Using cached analysis results")
+            return cached[1]
+            
         analysis_results = {}
         tech_analysis = {}
         
         try:
             # 複数のタイムフレームのデータを取得
-            logger.info(f"Fetching data for timeframes: {TRADING_INTERVALS}")
-            timeframe_data = self.data_fetcher.fetch_multi_timeframe_data(TRADING_INTERVALS)
+            logger.info("Fetching data for timeframes: %s", TRADING_INTERVALS)
+            # 通知処理はイベントループ外のスレッドで実行されるため、ここで新しいループを起動する
+            timeframe_data = asyncio.run(
+                self.data_fetcher.fetch_multi_timeframe_data_async(TRADING_INTERVALS)
+            )
             
             if not timeframe_data:
                 logger.error("Failed to fetch any timeframe data")
                 return {"error": "データ取得に失敗しました"}
                 
-            # 各タイムフレームごとにテクニカル分析
-            for timeframe, ohlcv_data in timeframe_data.items():
-                logger.info(f"Performing technical analysis for {timeframe}")
-                self.tech_analyzer.set_data(ohlcv_data)
-                tech_analysis[timeframe] = self.tech_analyzer.analyze_timeframe(timeframe)
+            # 各タイムフレームのテクニカル分析を並列に実行
+            logger.info("Performing technical analysis for timeframes: %s", list(timeframe_data.keys()))
+            tech_analysis = analyze_timeframes(timeframe_data)
             
-            # GPT分析を試行
+            # GPT分析を試行（シグナルとトレンドが前回から変わっていなければ前回成功した結果を使う）
             gpt_analysis = {}
+            tech_hash = self._tech_analysis_hash(tech_analysis)
             try:
-                logger.info("Performing GPT analysis for all timeframes")
-                gpt_analysis = self.gpt_analyzer.analyze_multi_timeframe(tech_analysis)
+                if tech_hash == self._last_tech_hash:
+                    gpt_analysis = dict(self._last_gpt)
+                    logger.info("Technical signals unchanged since last run. Reusing previous GPT analysis for: %s",
+                                list(gpt_analysis.keys()))
+                else:
+                    self._last_tech_hash = tech_hash
+                    self._last_gpt = {}
+                    
+                pending = {tf: data for tf, data in tech_analysis.items() if tf not in gpt_analysis}
+                if pending:
+                    logger.info("Performing GPT analysis for timeframes: %s", list(pending.keys()))
+                    fresh = self.gpt_analyzer.analyze_multi_timeframe(pending)
+                    gpt_analysis.update(fresh)
+                    # エラーになったタイムフレームは次回再度リクエストするため保持しない
+                    self._last_gpt.update({tf: result for tf, result in fresh.items() if "error" not in result})
             except Exception as gpt_error:
-                logger.warning(f"GPT分析に失敗しましたが、技術分析のみで継続します: {str(gpt_error)}")
+                logger.warning("GPT分析に失敗しましたが、技術分析のみで継続します: %s", gpt_error)
                 # GPT分析なしでも続行
             
             # 結果を統合
@@ -75,29 +122,44 @@ class TradingBot:
                         trend = tech_analysis[timeframe].get("summary", {}).get("trend", "不明")
                         
                         # シグナルから判断を決定
-                        judgment = "中立"
-                        if signals.get("overall", "") == "BUY":
-                            judgment = "弱い買い"
-                        elif signals.get("overall", "") == "STRONG_BUY":
-                            judgment = "強い買い"
-                        elif signals.get("overall", "") == "SELL":
-                            judgment = "弱い売り"
-                        elif signals.get("overall", "") == "STRONG_SELL":
-                            judgment = "強い売り"
+                        judgment = _SIGNAL_JUDGMENT.get(signals.get("overall", ""), _DEFAULT_JUDGMENT)
                         
                         analysis_results[timeframe] = {
                             "judgment": judgment,
-                            "outlook": f"{timeframe}のトレンドは{trend}です。GPT分析は利用できません。",
-                            "reasoning": "技術的指標のみに基づく判断です。",
-                            "advice": "詳細な分析はできませんが、テクニカル指標の総合判断に従ってください。"
+                            "outlook": _FALLBACK_OUTLOOK_TMPL.format_map({"timeframe": timeframe, "trend": trend}),
+                            "reasoning": _FALLBACK_REASONING,
+                            "advice": _FALLBACK_ADVICE
                         }
             
-            return {"results": analysis_results, "tech_data": tech_analysis}
+            result = {"results": analysis_results, "tech_data": tech_analysis}
+            # 古い時刻のエントリは不要なため、最新の結果のみを保持する
+            self._analysis_cache = {cache_key: (now, result)}
+            return result
             
         except Exception as e:
-            logger.exception(f"Error in run_analysis: {str(e)}")
+            logger.exception("Error in run_analysis: %s", e)
             return {"error": str(e)}
             
+    @staticmethod
+    def _tech_analysis_hash(tech_analysis: Dict[str, Any]) -> int:
+        """
+        テクニカル分析の判断材料（シグナルとトレンド）のシグネチャを計算
+        
+        Args:
+            tech_analysis: タイムフレームごとのテクニカル分析結果
+            
+        Returns:
+            int: シグナルとトレンドから計算したハッシュ値
+        """
+        return hash(tuple(
+            (
+                tf,
+                frozenset(tech_analysis[tf].get("signals", {}).items()),
+                tech_analysis[tf].get("summary", {}).get("trend")
+            )
+            for tf in sorted(tech_analysis)
+        ))
+        
     def send_notification(self) -> bool:
         """
         分析結果の通知を送信
@@ -105,10 +167,13 @@ class TradingBot:
         Returns:
             bool: 送信成功の場合はTrue
         """
+        # 1回の通知で記載する時刻を揃えるため、現在時刻は最初に1度だけ取得する
+        now = get_current_utc_time()
+        
         try:
             # 現在のセッションを判定
-            session = determine_current_session()
-            logger.info(f"Current trading session: {session}")
+            session = determine_current_session(now)
+            logger.info("Current trading session: %s", session)
             
             # 分析を実行
             analysis_data = self.run_analysis()
@@ -119,7 +184,8 @@ class TradingBot:
                 return self.notifier.send_error_notification(
                     error_msg,
                     exchange_id=self.data_fetcher.exchange_id,
-                    symbol=self.data_fetcher.symbol
+                    symbol=self.data_fetcher.symbol,
+                    now=now
                 )
             
             # 分析結果を取得
@@ -130,49 +196,76 @@ class TradingBot:
                 return self.notifier.send_error_notification(
                     "分析結果が利用できません",
                     exchange_id=self.data_fetcher.exchange_id,
-                    symbol=self.data_fetcher.symbol
+                    symbol=self.data_fetcher.symbol,
+                    now=now
                 )
                 
             # Discord通知を送信
-            success = self.notifier.send_market_analysis(analysis_results, session)
+            success = self.notifier.send_market_analysis(analysis_results, session, now)
             
             if success:
-                logger.info(f"Successfully sent {session} market analysis notification")
+                logger.info("Successfully sent %s market analysis notification", session)
             else:
-                logger.error(f"Failed to send {session} market analysis notification")
+                logger.error("Failed to send %s market analysis notification", session)
                 
             return success
             
         except Exception as e:
-            logger.exception(f"Error in send_notification: {str(e)}")
+            logger.exception("Error in send_notification: %s", e)
             error_msg = f"通知送信中にエラーが発生しました: {str(e)}"
             self.notifier.send_error_notification(
                 error_msg,
                 exchange_id=self.data_fetcher.exchange_id,
                 symbol=self.data_fetcher.symbol,
-                details={"エラータイプ": type(e).__name__}
+                details={"エラータイプ": type(e).__name__},
+                now=now
             )
             return False
             
+    async def send_notification_async(self) -> bool:
+        """
+        分析結果の通知をイベントループを止めずに送信
+        データ取得・GPT・Discordの各呼び出しはブロッキングのためスレッドで実行する
+        
+        Returns:
+            bool: 送信成功の場合はTrue
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.send_notification)
+        
     def schedule_notifications(self) -> None:
-        """通知スケジュールを設定"""
+        """通知スケジュールを設定（各通知時刻の次回実行時刻をヒープに登録）"""
+        now = get_current_utc_time()
         for time_str in NOTIFICATION_TIMES:
-            logger.info(f"Scheduling notification at {time_str} UTC")
-            schedule.every().day.at(time_str).do(self.send_notification)
+            logger.info("Scheduling notification at %s UTC", time_str)
+            hour, minute = map(int, time_str.split(":"))
+            next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            heapq.heappush(self._schedule_heap, next_run.timestamp())
             
         logger.info("All notifications scheduled successfully")
         
-    def run_scheduled(self) -> None:
+    async def run_scheduled(self) -> None:
         """スケジュールに従って実行"""
         self.schedule_notifications()
         
+        if not self._schedule_heap:
+            logger.error("No notification times configured")
+            return
+            
         logger.info("Starting scheduled execution. Press Ctrl+C to exit.")
-        try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # 1分ごとにスケジュールをチェック
-        except KeyboardInterrupt:
-            logger.info("Scheduled execution stopped by user")
+        while True:
+            # 最も近い通知時刻まで待機（定期的なポーリングは行わない）
+            next_run = self._schedule_heap[0]
+            next_time = datetime.fromtimestamp(next_run, timezone.utc)
+            logger.info("Next notification at %s UTC", next_time.strftime('%Y-%m-%d %H:%M'))
+            
+            await asyncio.sleep(max(0.0, next_run - time.time()))
+            await self.send_notification_async()
+            
+            # 実行した通知は翌日の同時刻に再登録
+            heapq.heapreplace(self._schedule_heap, next_run + 24 * 60 * 60)
             
     def run_once(self) -> None:
         """1回だけ実行（テスト用）"""
@@ -186,6 +279,7 @@ class TradingBot:
 
 def main():
     """メインエントリポイント"""
+    bot = None
     try:
         # 設定の検証
         if not validate_config():
@@ -198,14 +292,18 @@ def main():
         if len(sys.argv) > 1 and sys.argv[1] == "--once":
             bot.run_once()
         else:
-            bot.run_scheduled()
+            try:
+                asyncio.run(bot.run_scheduled())
+            except KeyboardInterrupt:
+                logger.info("Scheduled execution stopped by user")
             
     except Exception as e:
-        logger.exception(f"Unhandled exception in main: {str(e)}")
+        logger.exception("Unhandled exception in main: %s", e)
         
         # 設定されていればエラー通知も送信
         try:
-            notifier = DiscordNotifier()
+            # ボットが初期化済みであれば、その通知クラスの接続を再利用する
+            notifier = bot.notifier if bot is not None else DiscordNotifier()
             error_details = {
                 "エラータイプ": type(e).__name__,
                 "発生時刻": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -216,7 +314,7 @@ def main():
                 details=error_details
             )
         except Exception as notify_error:
-            logger.error(f"エラー通知の送信に失敗しました: {str(notify_error)}")
+            logger.error("エラー通知の送信に失敗しました: %s", notify_error)
             pass
         
         sys.exit(1)
@@ -1,10 +1,11 @@
 """
 Discord通知モジュール
 """
-import json
 import time
+import random
+import orjson
+import requests
 from typing import Dict, List, Any, Optional
-from discord_webhook import DiscordWebhook, DiscordEmbed
 from datetime import datetime
 
 from .utils.logger import get_notification_logger
@@ -13,9 +14,29 @@ from .config import DISCORD_WEBHOOK_URL, MAX_RETRIES, RETRY_DELAY
 
 logger = get_notification_logger()
 
+# 判断ごとの埋め込みの色
+_JUDGMENT_COLOR: Dict[str, int] = {
+    "強い買い": 0x00FF00,  # 緑
+    "弱い買い": 0x66CC66,  # 薄緑
+    "中立": 0xFFFF00,      # 黄色
+    "弱い売り": 0xFF6666,  # 薄赤
+    "強い売り": 0xFF0000,  # 赤
+}
+_DEFAULT_COLOR = 0x808080  # グレー
+
+# セッション名の日本語表記
+_SESSION_DISPLAY: Dict[str, str] = {
+    "asia": "アジアセッション",
+    "europe": "欧州セッション",
+    "us": "米国セッション"
+}
+
 class DiscordNotifier:
     """Discord通知を送信するクラス"""
     
+    # Webhookリクエストのタイムアウト（秒）
+    REQUEST_TIMEOUT = 10
+    
     def __init__(self, webhook_url: Optional[str] = None):
         """
         初期化
@@ -24,6 +45,9 @@ class DiscordNotifier:
             webhook_url: Discord Webhook URL (デフォルトはconfig.pyから取得)
         """
         self.webhook_url = webhook_url or DISCORD_WEBHOOK_URL
+        # 通知ごとのTCP/TLS接続の確立を避けるため、接続を使い回すセッションを保持する
+        self._session = requests.Session()
+        self._session.headers.update({"Content-Type": "application/json"})
         
     def send_message(self, content: str, embeds: List[Dict[str, Any]] = None) -> bool:
         """
@@ -40,62 +64,88 @@ class DiscordNotifier:
             logger.error("Discord webhook URL is not configured")
             return False
             
-        webhook = DiscordWebhook(url=self.webhook_url, content=content)
+        # 再試行時に再エンコードしないよう、送信前に一度だけシリアライズする
+        payload = orjson.dumps({"content": content, "embeds": embeds or []})
         
-        if embeds:
-            for embed_data in embeds:
-                embed = DiscordEmbed(**embed_data)
-                webhook.add_embed(embed)
-                
-        # 再試行メカニズム
+        # 再試行メカニズム（指数バックオフ）
         for attempt in range(MAX_RETRIES):
+            delay = RETRY_DELAY * 2 ** attempt + random.uniform(0, 0.5)
             try:
-                response = webhook.execute()
+                response = self._session.post(
+                    self.webhook_url, data=payload, timeout=self.REQUEST_TIMEOUT
+                )
                 
-                if response and response.status_code in [200, 204]:
-                    logger.info(f"Discord notification sent successfully")
+                if response.status_code in [200, 204]:
+                    logger.info("Discord notification sent successfully")
                     return True
                 else:
-                    status = response.status_code if response else "No response"
-                    logger.error(f"Failed to send Discord notification: Status {status}")
+                    logger.error("Failed to send Discord notification: Status %s", response.status_code)
                     
+                    if response.status_code == 429:
+                        # レート制限時はDiscordが指定する待機時間に従う
+                        delay = self._get_retry_after(response, delay)
+                        
                     if attempt < MAX_RETRIES - 1:
-                        logger.info(f"Retrying in {RETRY_DELAY} seconds... (Attempt {attempt + 1}/{MAX_RETRIES})")
-                        time.sleep(RETRY_DELAY)
+                        logger.info("Retrying in %.2f seconds... (Attempt %d/%d)", delay, attempt + 1, MAX_RETRIES)
+                        time.sleep(delay)
                     else:
                         return False
                         
             except Exception as e:
-                logger.error(f"Error sending Discord notification: {str(e)}")
+                logger.error("Error sending Discord notification: %s", e)
                 
                 if attempt < MAX_RETRIES - 1:
-                    logger.info(f"Retrying in {RETRY_DELAY} seconds... (Attempt {attempt + 1}/{MAX_RETRIES})")
-                    time.sleep(RETRY_DELAY)
+                    logger.info("Retrying in %.2f seconds... (Attempt %d/%d)", delay, attempt + 1, MAX_RETRIES)
+                    time.sleep(delay)
                 else:
                     return False
                     
         return False
         
-    def send_market_analysis(self, analysis_data: Dict[str, Any], session_name: str) -> bool:
+    @staticmethod
+    def _get_retry_after(response: requests.Response, default: float) -> float:
+        """
+        レート制限レスポンスから再試行までの待機時間を取得する
+        
+        Args:
+            response: ステータス429のレスポンス
+            default: 待機時間が取得できない場合の値
+            
+        Returns:
+            float: 待機時間（秒）
+        """
+        retry_after = response.headers.get("Retry-After") or response.headers.get("X-RateLimit-Reset-After")
+        if retry_after is None:
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            # レスポンス本文の retry_after は秒単位（小数）
+            retry_after = body.get("retry_after") if isinstance(body, dict) else None
+                
+        try:
+            return max(float(retry_after), 0.0)
+        except (TypeError, ValueError):
+            return default
+        
+    def send_market_analysis(self, analysis_data: Dict[str, Any], session_name: str, now: Optional[datetime] = None) -> bool:
         """
         市場分析結果の通知を送信する
         
         Args:
             analysis_data: 分析データ
             session_name: セッション名 (例: "asia", "europe", "us")
+            now: 通知に記載するUTC時間（指定しない場合は現在時刻）
             
         Returns:
             bool: 送信成功の場合はTrue
         """
-        now = get_current_utc_time()
+        if now is None:
+            now = get_current_utc_time()
         formatted_time = format_time_for_display(now)
         
         # セッション名を日本語に変換
-        session_display = {
-            "asia": "アジアセッション",
-            "europe": "欧州セッション",
-            "us": "米国セッション"
-        }.get(session_name.lower(), session_name)
+        session_display = _SESSION_DISPLAY.get(session_name.lower(), session_name)
         
         content = f"📊 **BTC/USDT {session_display}分析レポート** ({formatted_time})"
         
@@ -104,23 +154,17 @@ class DiscordNotifier:
         # タイムフレームごとの埋め込みを作成
         for timeframe, tf_analysis in analysis_data.items():
             if "error" in tf_analysis:
-                logger.error(f"Error in {timeframe} analysis: {tf_analysis['error']}")
+                logger.error("Error in %s analysis: %s", timeframe, tf_analysis['error'])
                 continue
                 
             judgment = tf_analysis.get("judgment", "不明")
             
             # 判断に基づいて色を設定
-            color = {
-                "強い買い": "00FF00",  # 緑
-                "弱い買い": "66CC66",  # 薄緑
-                "中立": "FFFF00",      # 黄色
-                "弱い売り": "FF6666",  # 薄赤
-                "強い売り": "FF0000",  # 赤
-            }.get(judgment, "808080")  # デフォルトはグレー
+            color = _JUDGMENT_COLOR.get(judgment, _DEFAULT_COLOR)
             
             embed = {
                 "title": f"{timeframe} 分析結果",
-                "color": int(color, 16),
+                "color": color,
                 "fields": [
                     {
                         "name": "判断",
@@ -155,10 +199,10 @@ class DiscordNotifier:
             logger.error("No valid analysis data to send")
             return False
         
-        logger.info(f"Sending {session_name} analysis with {len(embeds)} timeframes")
+        logger.info("Sending %s analysis with %d timeframes", session_name, len(embeds))
         return self.send_message(content, embeds)
         
-    def send_error_notification(self, error_message: str, exchange_id: str = None, symbol: str = None, details: Dict[str, Any] = None) -> bool:
+    def send_error_notification(self, error_message: str, exchange_id: str = None, symbol: str = None, details: Dict[str, Any] = None, now: Optional[datetime] = None) -> bool:
         """
         エラー通知を送信する
         
@@ -167,11 +211,13 @@ class DiscordNotifier:
             exchange_id: 取引所ID
             symbol: 通貨ペア
             details: 追加の詳細情報
+            now: 通知に記載するUTC時間（指定しない場合は現在時刻）
             
         Returns:
             bool: 送信成功の場合はTrue
         """
-        now = get_current_utc_time()
+        if now is None:
+            now = get_current_utc_time()
         formatted_time = format_time_for_display(now)
         
         # 取引所と通貨ペアの情報を含めたタイトルを作成
@@ -189,7 +235,7 @@ class DiscordNotifier:
             "title": f"エラーが発生しました{title_suffix}",
             "description": error_message,
             "color": int("FF0000", 16),  # 赤色
-            "timestamp": now,  # datetimeオブジェクトをそのまま渡す
+            "timestamp": now.isoformat(),
             "fields": []
         }
         
@@ -200,8 +246,11 @@ class DiscordNotifier:
                     # 追加情報が複雑なオブジェクトの場合はJSON形式に変換
                     if isinstance(value, (dict, list)):
                         try:
-                            value_str = json.dumps(value, indent=2, ensure_ascii=False)
-                        except:
+                            value_str = orjson.dumps(
+                                value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                            ).decode()
+                        except (TypeError, ValueError):
+                            # orjson.JSONEncodeError は TypeError のサブクラス
                             value_str = str(value)
                     else:
                         value_str = str(value)
@@ -218,5 +267,5 @@ class DiscordNotifier:
                 "text": f"TRAND Bot • フォールバック取引所を試行中"
             }
         
-        logger.info(f"Sending error notification: {error_message}")
+        logger.info("Sending error notification: %s", error_message)
         return self.send_message(content, [embed])
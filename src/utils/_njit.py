@@ -0,0 +1,30 @@
+"""
+Numba JITコンパイルのユーティリティ
+"""
+from typing import Any, Callable
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba未導入の環境でもモジュールを読み込めるようにする
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args: Any, **kwargs: Any) -> Callable:
+    """
+    numba.njit のラッパー
+
+    numbaが利用できない場合は関数をそのまま返す。
+    `@njit` と `@njit(...)` の両方の書き方に対応する。
+
+    Returns:
+        Callable: コンパイル済み関数、またはデコレータ
+    """
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    return lambda func: func
@@ -1,18 +1,52 @@
 """
 ロギングユーティリティモジュール
 """
+import atexit
 import logging
+import queue
 import sys
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
 
 from ..config import LOG_DIR, LOG_LEVEL, LOG_FORMAT, LOG_DATE_FORMAT
 
+
+class _FileRouter(logging.Handler):
+    """ロガー名ごとのファイルハンドラにログレコードを振り分けるハンドラ"""
+    
+    def __init__(self):
+        """初期化"""
+        super().__init__()
+        self.handlers: Dict[str, logging.Handler] = {}
+        
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        ログレコードを出力元ロガーのファイルハンドラに渡す
+        
+        Args:
+            record: ログレコード
+        """
+        handler = self.handlers.get(record.name)
+        if handler is not None:
+            handler.handle(record)
+
+
+# ファイルへの書き込みはバックグラウンドのリスナースレッドで行い、ログ出力元をブロックしない
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_file_router = _FileRouter()
+_listener = QueueListener(_log_queue, _file_router)
+_listener.start()
+atexit.register(_listener.stop)
+
+
+@lru_cache(maxsize=None)
 def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
     """
     ロギング設定を行いロガーを返す
+    同じ引数での2回目以降の呼び出しは、ハンドラを作り直さずに設定済みのロガーを返す
     
     Args:
         name: ロガー名
@@ -43,7 +77,8 @@ def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
         file_path, maxBytes=10*1024*1024, backupCount=5, encoding='utf-8'
     )
     file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
-    logger.addHandler(file_handler)
+    _file_router.handlers[name] = file_handler
+    logger.addHandler(QueueHandler(_log_queue))
     
     return logger
 
@@ -2,8 +2,23 @@
 時間関連のユーティリティ関数
 """
 from datetime import datetime, timedelta
-import pytz
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from typing import List, Dict, Optional, Tuple, FrozenSet
+
+# タイムゾーンは呼び出しごとに読み込まないよう、モジュール読み込み時に一度だけ取得する
+_UTC = ZoneInfo("UTC")
+_JST = ZoneInfo("Asia/Tokyo")
+
+# UTCの時（0-23）ごとの取引セッション
+_SESSION_BY_HOUR: Tuple[str, ...] = (
+    ("asia",) * 8       # UTC 0:00-8:00 (JST 9:00-17:00)
+    + ("europe",) * 8   # UTC 8:00-16:00
+    + ("us",) * 8       # UTC 16:00-24:00
+)
+
+# 通知時間とみなす前後の幅（分）
+NOTIFICATION_WINDOW_MINUTES = 5
 
 
 def get_current_utc_time() -> datetime:
@@ -13,7 +28,7 @@ def get_current_utc_time() -> datetime:
     Returns:
         datetime: 現在のUTC時間
     """
-    return datetime.now(pytz.UTC)
+    return datetime.now(_UTC)
 
 
 def get_jst_time() -> datetime:
@@ -23,8 +38,7 @@ def get_jst_time() -> datetime:
     Returns:
         datetime: 現在の日本時間
     """
-    jst = pytz.timezone('Asia/Tokyo')
-    return datetime.now(jst)
+    return datetime.now(_JST)
 
 
 def format_time_for_display(dt: datetime) -> str:
@@ -50,20 +64,7 @@ def is_market_hours(market_type: str) -> bool:
     Returns:
         bool: 取引時間内であればTrue
     """
-    now = get_current_utc_time()
-    hour = now.hour
-    
-    if market_type.lower() == "asia":
-        # UTC 0:00-8:00 (JST 9:00-17:00)
-        return 0 <= hour < 8
-    elif market_type.lower() == "europe":
-        # UTC 8:00-16:00
-        return 8 <= hour < 16
-    elif market_type.lower() == "us":
-        # UTC 16:00-24:00
-        return 16 <= hour < 24
-    
-    return False
+    return _SESSION_BY_HOUR[get_current_utc_time().hour] == market_type.lower()
 
 
 def get_timeframe_start_end(timeframe: str) -> Tuple[datetime, datetime]:
@@ -98,45 +99,54 @@ def get_timeframe_start_end(timeframe: str) -> Tuple[datetime, datetime]:
     return start, end
 
 
-def determine_current_session() -> str:
+def determine_current_session(now: Optional[datetime] = None) -> str:
     """
     現在どの取引セッション（アジア/欧州/米国）かを判定する
     
+    Args:
+        now: 判定に使うUTC時間（指定しない場合は現在時刻）
+        
     Returns:
         str: 現在のセッション名 ("asia", "europe", "us")
     """
-    if is_market_hours("asia"):
-        return "asia"
-    elif is_market_hours("europe"):
-        return "europe"
-    else:
-        return "us"
+    if now is None:
+        now = get_current_utc_time()
+    return _SESSION_BY_HOUR[now.hour]
 
 
-def is_notification_time(notification_times: List[str]) -> bool:
+def is_notification_time(notification_times: List[str], now: Optional[datetime] = None) -> bool:
     """
     通知時間かどうかを判定する
     
     Args:
         notification_times: 通知時間のリスト (例: ["09:00", "17:00", "01:00"])
+        now: 判定に使うUTC時間（指定しない場合は現在時刻）
         
     Returns:
         bool: 通知時間であればTrue
     """
-    now = get_current_utc_time()
-    current_time = now.strftime("%H:%M")
+    if now is None:
+        now = get_current_utc_time()
+    return now.hour * 60 + now.minute in build_notification_index(tuple(notification_times))
+
+
+@lru_cache(maxsize=4)
+def build_notification_index(notification_times: Tuple[str, ...]) -> FrozenSet[int]:
+    """
+    通知時間とみなす時刻（0時からの経過分）の集合を作成する
+    各通知時間の前後5分以内を含み、日付をまたぐ範囲は翌日・前日側に折り返す
     
-    # 完全一致（時分が同じ）
-    if current_time in notification_times:
-        return True
+    Args:
+        notification_times: 通知時間のタプル (例: ("09:00", "17:00", "01:00"))
         
-    # 指定時間から5分以内
+    Returns:
+        FrozenSet[int]: 通知時間とみなす0時からの経過分の集合
+    """
+    index = set()
     for time_str in notification_times:
         hour, minute = map(int, time_str.split(":"))
-        target_time = now.replace(hour=hour, minute=minute)
-        
-        time_diff = abs((now - target_time).total_seconds())
-        if time_diff <= 300:  # 5分 = 300秒
-            return True
+        target = hour * 60 + minute
+        for delta in range(-NOTIFICATION_WINDOW_MINUTES, NOTIFICATION_WINDOW_MINUTES + 1):
+            index.add((target + delta) % (24 * 60))
             
-    return False
+    return frozenset(index)